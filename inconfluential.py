@@ -1,19 +1,114 @@
 #!/usr/bin/python3
+import collections
 import datetime
+import hashlib
+import json
 import logging
 import os
+import random
+import re
 import subprocess
+import sys
+import threading
 import time
+from html import escape as escape_html
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from atlassian import Confluence
 from atlassian.errors import ApiError
+from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from markdownify import MarkdownConverter
-from markdownify import markdownify as md
-from tqdm import tqdm
+from requests import HTTPError
+from requests.adapters import HTTPAdapter
+from tqdm.auto import tqdm
+
+# Prefer lxml's C-backed parser over the pure-Python html.parser; it handles
+# large macro-heavy Confluence pages several times faster.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Confluence storage format wraps code bodies in CDATA sections, which lxml's
+# HTML parser mangles into comments (dropping the content); unwrap them into
+# escaped text before parsing so code bodies survive under either parser.
+_CDATA_SECTION = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.DOTALL)
+
+# Prefer pygit2 (libgit2) so index updates and commits run in-process with no
+# fork/exec; the git CLI remains as a fallback when it is not installed.
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# Prefer orjson's C-backed decoder for Confluence responses; body.storage
+# payloads are large JSON documents with macro-heavy HTML embedded in them.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Backoff bounds (seconds) for retrying rate-limited requests
+RATE_LIMIT_BACKOFF_BASE = 0.1
+RATE_LIMIT_BACKOFF_CAP = 30
+
+# Per-page log calls are guarded with isEnabledFor and use %-style deferred
+# formatting, so they cost nothing when INFO logging is off
+logger = logging.getLogger(__name__)
+
+# Characters that are illegal or hazardous in filenames on at least one
+# supported filesystem (Windows reserved punctuation plus control chars)
+_ILLEGAL_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+def title_to_filename(destination, title):
+    """
+    Build the Markdown file path for a page title.
+
+    All filesystem-hostile characters are replaced, not just '/', and the name
+    is truncated to a safe length. A stable mapping matters beyond portability:
+    if sanitization varied between runs, the version and hash skip checks would
+    look at the wrong file and silently redo (and re-stage) the page.
+
+    Args:
+        destination (str): Directory the Markdown file will be saved to.
+        title (str): The Confluence page title.
+
+    Returns:
+        str: The full path of the Markdown file for this page.
+    """
+    safe_title = _ILLEGAL_FILENAME_CHARS.sub('_', title)[:200]
+    return os.path.join(destination, f"{safe_title}.md")
+
+# Serialize access to the git index and to the shared JSON state files when
+# multiple spaces are synced concurrently
+_git_index_lock = threading.Lock()
+_state_lock = threading.Lock()
 
 
 
+class ConfluenceClient(Confluence):
+    """
+    Confluence client that decodes JSON responses with orjson when available.
+
+    The stock client parses every response with the stdlib `json` module;
+    page-body payloads are large enough that the decode shows up once network
+    waits and conversion are out of the way. Falls back to the stock parsing
+    when orjson is not installed or a payload fails to decode.
+    """
+
+    @staticmethod
+    def _response_handler(response):
+        if orjson is not None:
+            try:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                pass  # Empty or non-JSON body; defer to the stock handler
+        return Confluence._response_handler(response)
+
+
 class AtlassianConverter(MarkdownConverter):
     """
     Converts Confluence HTML content to Markdown, handling Confluence-specific macros.
@@ -23,11 +118,11 @@ class AtlassianConverter(MarkdownConverter):
     to Markdown-compatible syntax or removing unnecessary Confluence-specific markup.
     """
 
-    def __init__(self, **options):
-        super().__init__(**options)
-        setattr(self, 'convert_ac:structured-macro', self.convert_ac_structured_macro)
-        setattr(self, 'convert_ac:parameter', self.convert_ac_parameter)
-        setattr(self, 'convert_ac:plain-text-body', self.convert_ac_plain_text_body)
+    def convert(self, html):
+        # markdownify hardcodes html.parser; parse here so lxml is used when available
+        html = _CDATA_SECTION.sub(lambda m: escape_html(m.group(1)), html)
+        soup = BeautifulSoup(html, HTML_PARSER)
+        return self.convert_soup(soup)
 
     def convert_ac_structured_macro(self, el, text, convert_as_inline):
         return text
@@ -43,6 +138,206 @@ class AtlassianConverter(MarkdownConverter):
         else:
             return self.convert_p(el, text, convert_as_inline)
 
+    # Precompiled dispatch for the ac:-prefixed tags; their names aren't valid
+    # Python identifiers, so markdownify's getattr lookup goes through
+    # __getattr__ below instead of a normal method.
+    _AC_CONVERTERS = {
+        'ac:structured-macro': convert_ac_structured_macro,
+        'ac:parameter': convert_ac_parameter,
+        'ac:plain-text-body': convert_ac_plain_text_body,
+    }
+
+    def __getattr__(self, attr):
+        if attr.startswith('convert_'):
+            converter = self._AC_CONVERTERS.get(attr[len('convert_'):])
+            if converter is not None:
+                bound = converter.__get__(self, type(self))
+                # Cache on the instance so later lookups skip __getattr__ entirely
+                setattr(self, attr, bound)
+                return bound
+        return super().__getattr__(attr)
+
+
+# Converter instances are stateless with respect to input, so one per worker
+# thread is enough; constructing a fresh AtlassianConverter per page just
+# repeats __init__'s attribute wiring. Thread-local storage keeps each worker
+# on its own instance so no BeautifulSoup internals are ever shared.
+_converters = threading.local()
+
+# In-process LRU over conversion results, keyed by content hash. Spaces often
+# contain byte-identical template/boilerplate pages; duplicates within a run
+# hit here without even a disk read. Bounded so memory stays flat; the disk
+# cache still covers everything across runs.
+_CONVERT_MEMO_MAX = 4096
+_convert_memo = collections.OrderedDict()
+_convert_memo_lock = threading.Lock()
+
+
+def get_converter():
+    """
+    Return this thread's shared `AtlassianConverter`, creating it on first use.
+
+    Returns:
+        AtlassianConverter: The converter instance for the calling thread.
+    """
+    converter = getattr(_converters, 'instance', None)
+    if converter is None:
+        converter = _converters.instance = AtlassianConverter()
+    return converter
+
+
+def _memoize_conversion(key, markdown):
+    """
+    Record a conversion result in the in-process LRU, evicting the oldest
+    entry once the bound is reached.
+
+    Args:
+        key (str): Content-hash key of the converted HTML.
+        markdown (str): The conversion result to remember.
+    """
+    with _convert_memo_lock:
+        _convert_memo[key] = markdown
+        _convert_memo.move_to_end(key)
+        if len(_convert_memo) > _CONVERT_MEMO_MAX:
+            _convert_memo.popitem(last=False)
+
+
+def convert_cached(html, cache_dir):
+    """
+    Convert Confluence storage HTML to Markdown, memoized on a content hash.
+
+    Conversion is deterministic, so results are keyed by a hash of the raw
+    HTML and persisted under `cache_dir`. On steady-state runs where most
+    pages are unchanged this reduces the conversion cost to a hash plus a
+    small disk read. Entries invalidate implicitly when the HTML changes.
+
+    Args:
+        html (str): Raw Confluence storage-format HTML.
+        cache_dir (str): Directory holding cached conversions.
+
+    Returns:
+        str: The Markdown conversion of `html`.
+    """
+    key = hashlib.blake2b(html.encode('utf-8'), digest_size=16).hexdigest()
+    cache_path = os.path.join(cache_dir, key[:2], key)
+
+    # Identical bodies within a run (boilerplate/template pages) hit in memory
+    with _convert_memo_lock:
+        if key in _convert_memo:
+            _convert_memo.move_to_end(key)
+            return _convert_memo[key]
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            markdown = f.read()
+        _memoize_conversion(key, markdown)
+        return markdown
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"\tCache: Failed to read cached conversion \'{cache_path}\': {e}")
+
+    markdown = get_converter().convert(html)
+    _memoize_conversion(key, markdown)
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Write to a temp file and rename so a crash never leaves a truncated entry
+        tmp_path = f"{cache_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(markdown)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logging.warning(f"\tCache: Failed to write cached conversion \'{cache_path}\': {e}")
+
+    return markdown
+
+
+def load_page_versions(git_root):
+    """
+    Load the persisted page-version map from `versions.json` under `git_root`.
+
+    Structure: `{space_key: {page_id: {"v": N, "title": "..."}}}`. Pages whose
+    version number matches this map can be skipped without converting.
+
+    Args:
+        git_root (str): Path to the root of the export git repository.
+
+    Returns:
+        dict: The stored version map, or an empty dict if none exists yet.
+    """
+    versions_path = os.path.join(git_root, 'versions.json')
+    try:
+        with open(versions_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Failed to load \'{versions_path}\'; treating all pages as changed: {e}")
+        return {}
+
+
+def save_page_versions(git_root, versions):
+    """
+    Persist the page-version map to `versions.json` under `git_root`.
+
+    Args:
+        git_root (str): Path to the root of the export git repository.
+        versions (dict): Version map as described in `load_page_versions`.
+    """
+    versions_path = os.path.join(git_root, 'versions.json')
+    try:
+        tmp_path = f"{versions_path}.tmp.{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(versions, f, indent=2)
+        os.replace(tmp_path, versions_path)
+    except Exception as e:
+        logging.error(f"Failed to save \'{versions_path}\': {e}")
+
+
+def _process_one_page(destination, cache_dir, page):
+    """
+    Convert a single page to Markdown.
+
+    Runs inside a worker thread: conversion is CPU-bound and touches no shared
+    state. Writing and git staging stay on the main thread. The page body and
+    version arrive already expanded in the space listing, so no extra request
+    is made here.
+
+    Args:
+        destination (str): Directory the Markdown file will be saved to.
+        cache_dir (str): Directory holding cached conversions.
+        page (dict): Page from the expanded listing (includes 'body.storage' and 'version').
+
+    Returns:
+        tuple: (filename, markdown) ready to be written to disk.
+    """
+    page_id = page['id']
+    page_title = page['title']
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Processing page: '%s' (ID: %s)", page_title, page_id)
+
+    account_id = page['version']['by'].get('accountId', 'unknown')
+    display_name = page['version']['by'].get('displayName', 'Unknown User')
+    timestamp = page['version'].get('when', 'unknown time')
+
+    page_as_markdown = convert_cached(page['body']['storage']['value'], cache_dir)
+
+    # YAML front-matter keeps the metadata parseable and the output bytes
+    # stable between runs, so the unchanged-content checks actually hit.
+    markdown = (f"---\n"
+                f"account_id: {account_id}\n"
+                f"author: {display_name!r}\n"
+                f"last_updated: {timestamp}\n"
+                f"---\n\n"
+                f"{page_as_markdown}")
+
+    filename = title_to_filename(destination, page_title)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\tPage: '%s' converted to markdown.", page_title)
+
+    return filename, markdown
+
 
 def fetch_pages_and_save(confluence, space, destination, git_root, batch_size=100, max_retries=5):
     """
@@ -60,18 +355,23 @@ def fetch_pages_and_save(confluence, space, destination, git_root, batch_size=10
         bool: True if any pages were updated, False otherwise.
     """
     import math
-    from tqdm import tqdm
 
     page_count = 0
     retry_count = 0
     more_pages = True  # Flag to indicate whether more pages are available
     changes_made = False
+    max_workers = int(os.getenv("INCONFLUENTIAL_WORKERS", "12"))
+    cache_dir = os.path.join(git_root, '.inconfluential-cache')
+    versions = load_page_versions(git_root)
+    space_versions = versions.setdefault(space, {})
+    manifest = load_manifest(git_root)
 
     os.makedirs(destination, exist_ok=True)
 
     logging.info(f"\n\tConfiguration Variables: \n"
                  f"\t\tPages per Batch: {batch_size}\n"
-                 f"\t\tMax Retries: {max_retries}\n")
+                 f"\t\tMax Retries: {max_retries}\n"
+                 f"\t\tWorker Threads: {max_workers}\n")
 
     # Get total number of pages to set total for tqdm
     try:
@@ -83,65 +383,83 @@ def fetch_pages_and_save(confluence, space, destination, git_root, batch_size=10
         logging.error(f"Failed to retrieve total page count: {e}")
         total_batches = None  # Unknown total
 
-    with tqdm(total=total_batches, desc=f"Processing space \'{space}\'", unit='batch') as pbar_batches:
+    # Progress bars are pure overhead when output is redirected (CI, cron);
+    # disable them off-TTY and throttle refreshes otherwise.
+    show_progress = sys.stderr.isatty()
+
+    with tqdm(total=total_batches, desc=f"Processing space \'{space}\'", unit='batch',
+              disable=not show_progress, mininterval=0.5) as pbar_batches:
         while more_pages:
             logging.info("Batch found.")
             try:
                 # Fetch a batch of pages
                 logging.info(f"Pulling next batch of {batch_size}... ")
-                pages = confluence.get_all_pages_from_space(space, start=page_count, limit=batch_size)
+                # One expanded listing call returns bodies and versions inline,
+                # avoiding a follow-up GET per page (the classic N+1 pattern).
+                response = confluence.get("rest/api/content", params={
+                    "spaceKey": space,
+                    "type": "page",
+                    "start": page_count,
+                    "limit": batch_size,
+                    "expand": "body.storage,version"
+                })
+                pages = response.get('results', [])
 
                 if pages:
                     logging.info("Pulled.\n")
 
-                    # Process each individual page with progress bar
-                    with tqdm(total=len(pages), desc="Processing batch", unit='page', leave=False) as pbar_pages:
-                        for page in pages:
-                            page_id = page['id']
-                            page_title = page['title']
-                            logging.info(f"Processing page: \'{page_title}\' (ID: {page_id})")
-
-                            try:
-                                page_data = confluence.get_page_by_id(page_id, expand="body.storage,version")
-
-                                account_id = page_data['version']['by'].get('accountId', 'unknown')
-                                display_name = page_data['version']['by'].get('displayName', 'Unknown User')
-                                timestamp = page_data['version'].get('when', 'unknown time')
+                    # Fetch and convert pages concurrently; the loop below drains
+                    # results on the main thread so file writes and git staging
+                    # (git is not thread-safe) stay serialized.
+                    with tqdm(total=len(pages), desc="Processing batch", unit='page', leave=False,
+                              disable=not show_progress, mininterval=0.5,
+                              miniters=max(1, batch_size // 20)) as pbar_pages:
+                        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                            futures = {}
+                            for page in pages:
+                                # Skip pages whose version number matches the last
+                                # successful run; only edited pages pay any cost.
+                                version_number = page.get('version', {}).get('number')
+                                known = space_versions.get(str(page['id']))
+                                filename = title_to_filename(destination, page['title'])
+                                if (known is not None and version_number is not None
+                                        and known.get('v') == version_number
+                                        and os.path.exists(filename)):
+                                    if logger.isEnabledFor(logging.INFO):
+                                        logger.info("\tPage: '%s' unchanged at version %s; skipping.", page['title'], version_number)
+                                    pbar_pages.update(1)
+                                    continue
+                                futures[executor.submit(_process_one_page, destination, cache_dir, page)] = page
+
+                            for future in as_completed(futures):
+                                page = futures[future]
+                                page_title = page['title']
 
-                                author_data = {
-                                    "Account ID": account_id,
-                                    "Author Name": display_name,
-                                    "Last Updated": timestamp
-                                }
+                                try:
+                                    filename, markdown = future.result()
 
-                                page_as_markdown = AtlassianConverter().convert(page_data['body']['storage']['value'])
-                                metadata_as_markdown = md(str(author_data).replace('{','Metadata: ').replace('}',""))
-                                markdown = f"{page_as_markdown}\n\n{metadata_as_markdown}"
+                                    try:
+                                        # Write the file only if there are changes; git detects
+                                        # what actually changed in one pass after the run
+                                        write_if_changed(filename, markdown, git_root, manifest)
 
-                                filename = os.path.join(destination, f"{page_title.replace('/', '_')}.md")
-                                logging.info(f"\tPage: \'{page_title}\' converted to markdown. Writing...")
+                                        # Record the version only once the page is safely on disk
+                                        version_number = page.get('version', {}).get('number')
+                                        if version_number is not None:
+                                            space_versions[str(page['id'])] = {"v": version_number, "title": page_title}
+                                    except Exception as e:
+                                        logging.error(f"\tPage: Writing failed! \'{filename}\' will not be written: {e}")
 
-                                try:
-                                    # Attempt to write the file only if there are changes
-                                    if write_if_changed(filename, markdown):
-                                        # Pass the git_root (export_destination) to stage_file
-                                        stage_file(git_root, filename)
-                                        changes_made = True
-                                    else:
-                                        logging.info(f"\tPage: Skipping git add for \'{filename}\' as no changes were made.")
                                 except Exception as e:
-                                    logging.error(f"\tPage: Writing failed! \'{filename}\' will not be written: {e}")
+                                    logging.warning(f"Unknown error occurred while processing \"{page_title}\": {e}\n")
 
-                            except ApiError as e:
-                                tqdm.write(f"Page: Failed to retrieve page \'{page_title}\': {e}")
-                                logging.warning(f"\tPage: Failed to retrieve page \'{page_title}\': {e}\n")
-                            except Exception as e:
-                                logging.warning(f"Unknown error occurred while processing \"{page_title}\": {e}\n")
+                                pbar_pages.update(1)  # Update page progress bar
 
-                            pbar_pages.update(1)  # Update page progress bar
-
-                    # Move to the next batch of pages
-                    page_count += batch_size
+                    # Move to the next batch of pages; advance by what the
+                    # server actually returned -- Confluence silently caps
+                    # expanded requests below the requested limit, and assuming
+                    # batch_size would skip the difference entirely
+                    page_count += len(pages)
                     pbar_batches.update(1)  # Update batch progress bar
 
                 else:
@@ -150,12 +468,19 @@ def fetch_pages_and_save(confluence, space, destination, git_root, batch_size=10
 
                 retry_count = 0  # Reset retry count on a successful fetch
 
-            except ApiError as e:
-                # Handle rate limiting
-                if e.response.status_code == 429:
-                    retry_after = int(e.response.headers.get('Retry-After', '1'))
-                    print(f"Rate limit hit. Retrying after {retry_after} seconds...")
-                    time.sleep(retry_after)
+            except (ApiError, HTTPError) as e:
+                # Handle rate limiting; the client surfaces HTTP failures as
+                # requests.HTTPError (via raise_for_status), not ApiError
+                response = getattr(e, 'response', None)
+                if response is not None and response.status_code == 429:
+                    # Capped exponential backoff with jitter so concurrent
+                    # retries don't hit the server in lockstep; the server's
+                    # Retry-After is respected as a lower bound.
+                    retry_after = int(response.headers.get('Retry-After', '0'))
+                    delay = min(RATE_LIMIT_BACKOFF_CAP, RATE_LIMIT_BACKOFF_BASE * 2 ** retry_count)
+                    delay = max(retry_after, random.uniform(delay * 0.5, delay * 1.5))
+                    print(f"Rate limit hit. Retrying after {delay:.1f} seconds...")
+                    time.sleep(delay)
                     retry_count += 1
                     logging.warning(f"\t\t\tWARNING: You are getting rate-limited (retry_count={retry_count}).\n")
                     if retry_count >= max_retries:
@@ -166,42 +491,126 @@ def fetch_pages_and_save(confluence, space, destination, git_root, batch_size=10
                     logging.error(f"Error fetching pages from space \'{space}\': {e}\n")
                     break  # Stop on non-rate-limiting errors
 
+    changes_made = stage_and_detect_changes(git_root, destination)
+
+    # Merge this space's results back under the lock: other spaces may have
+    # persisted newer entries for their own keys since we loaded the files.
+    with _state_lock:
+        merged_manifest = load_manifest(git_root)
+        space_prefix = os.path.relpath(destination, git_root) + os.sep
+        merged_manifest.update({k: v for k, v in manifest.items() if k.startswith(space_prefix)})
+        save_manifest(git_root, merged_manifest)
+
+        merged_versions = load_page_versions(git_root)
+        merged_versions[space] = space_versions
+        save_page_versions(git_root, merged_versions)
+
     return changes_made
 
 
 
-def write_if_changed(filename, new_content):
+def load_manifest(git_root):
+    """
+    Load the content-hash manifest from `.inconfluential-manifest.json` under `git_root`.
+
+    Structure: `{relative_filename: sha256_hexdigest}`. Files whose stored hash
+    matches the new content can be skipped without reading them back from disk.
+
+    Args:
+        git_root (str): Path to the root of the export git repository.
+
+    Returns:
+        dict: The stored manifest, or an empty dict if none exists yet.
+    """
+    manifest_path = os.path.join(git_root, '.inconfluential-manifest.json')
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Failed to load \'{manifest_path}\'; falling back to content compares: {e}")
+        return {}
+
+
+def save_manifest(git_root, manifest):
+    """
+    Persist the content-hash manifest to `.inconfluential-manifest.json` under `git_root`.
+
+    Args:
+        git_root (str): Path to the root of the export git repository.
+        manifest (dict): Manifest as described in `load_manifest`.
+    """
+    manifest_path = os.path.join(git_root, '.inconfluential-manifest.json')
+    try:
+        tmp_path = f"{manifest_path}.tmp.{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+    except Exception as e:
+        logging.error(f"Failed to save \'{manifest_path}\': {e}")
+
+
+def write_if_changed(filename, new_content, git_root, manifest):
     """
     Writes new content to a file only if it differs from the existing content.
 
+    The change check compares a sha256 of the new content against the stored
+    manifest entry first, so unchanged files cost one hash instead of a full
+    read. The prior file content is only read when no manifest entry exists.
+
     Args:
         filename (str): Path of the file to write.
         new_content (str): The new content to potentially write to the file.
+        git_root (str): Path to the root of the export git repository.
+        manifest (dict): Content-hash manifest, updated in place on writes.
 
     Returns:
         bool: True if the file was updated, False if no changes were made.
+
+    Raises:
+        Exception: If the write fails. Callers must not treat the page as
+            processed (e.g. record its version) when this happens.
     """
+    manifest_key = os.path.relpath(filename, git_root)
+    new_bytes = new_content.encode('utf-8')  # Encoded once, reused for hash, compare and write
+    new_hash = hashlib.sha256(new_bytes).hexdigest()
+
     try:
-        # Check if the file already exists
         if os.path.exists(filename):
-            # Read the existing content
-            with open(filename, 'r') as f:
-                existing_content = f.read()
-
-            # Compare with the new content; if identical, skip writing
-            if existing_content == new_content:
-                logging.info(f"\tGit: No changes detected in \'{filename}\'; skipping write.")
+            # The manifest settles the common unchanged case without any reads
+            if manifest.get(manifest_key) == new_hash:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("\tGit: No changes detected in '%s'; skipping write.", filename)
                 return False  # No update necessary
 
-        # If the file doesn't exist or content has changed, write new content
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        logging.info(f"\tGit: Changes detected; \'{filename}\' has been updated.")
+            # No manifest entry (first run, or manifest lost); compare content,
+            # but check the byte length first -- a stat is far cheaper than a read
+            if manifest_key not in manifest and os.stat(filename).st_size == len(new_bytes):
+                with open(filename, 'rb') as f:
+                    existing_bytes = f.read()
+
+                if existing_bytes == new_bytes:
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("\tGit: No changes detected in '%s'; skipping write.", filename)
+                    manifest[manifest_key] = new_hash
+                    return False  # No update necessary
+
+        # If the file doesn't exist or content has changed, write new content.
+        # Write to a temp file and rename so a crash mid-write can never leave
+        # a truncated file that disagrees with the manifest.
+        tmp_path = f"{filename}.tmp.{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(new_bytes)
+        os.replace(tmp_path, filename)
+        manifest[manifest_key] = new_hash
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\tGit: Changes detected; '%s' has been updated.", filename)
         return True  # File was written/updated
 
     except Exception as e:
         logging.error(f"\tGit: Error while writing to \'{filename}\': {e}")
-        return False  # In case of error, assume no update was made
+        raise  # A failed write must not look like "unchanged" to the caller
 
 
 def ensure_git_repo(git_root):
@@ -216,10 +625,13 @@ def ensure_git_repo(git_root):
         # Check if .git folder exists, indicating a Git repository
         if not os.path.isdir(os.path.join(git_root, '.git')):
             logging.info(f"Initializing Git repository in \'{git_root}\'")
-            result = subprocess.run(["git", "init"], cwd=git_root, check=True, stderr=subprocess.PIPE, text=True)
+            if pygit2 is not None:
+                pygit2.init_repository(git_root)
+            else:
+                result = subprocess.run(["git", "init"], cwd=git_root, check=True, stderr=subprocess.PIPE, text=True)
 
-            if result.returncode != 0:
-                logging.error(f"Git init failed for \'{git_root}\': {result.stderr}")
+                if result.returncode != 0:
+                    logging.error(f"Git init failed for \'{git_root}\': {result.stderr}")
 
             logging.info("Git repository initialized.")
         else:
@@ -230,30 +642,73 @@ def ensure_git_repo(git_root):
         logging.error(f"Unexpected error while checking Git repository status: {e}")
 
 
-def stage_file(git_root, filename):
+def stage_and_detect_changes(git_root, destination):
     """
-    Adds the specified file to git staging area.
+    Stage everything under `destination` and report whether anything changed.
+
+    A single `git add -A` per space replaces per-file staging bookkeeping, and
+    git's own index (which compares mtime/size in C before touching content)
+    becomes the change detector: one `git diff --cached` answers whether the
+    space produced any updates.
 
     Args:
         git_root (str): Path to the root of the git repository.
-        filename (str): The file to add to staging area.
-    """
-    try:
-        # Ensure the file path is an absolute path
-        filepath = os.path.abspath(filename)
+        destination (str): Directory whose contents should be staged.
 
-        # Add the file to Git
-        result = subprocess.run(["git", "add", filepath], cwd=git_root, check=True, stderr=subprocess.PIPE, text=True)
-
-        if result.returncode != 0:
-            logging.error(f"Git add failed for \'{filename}\': {result.stderr}")
+    Returns:
+        bool: True if any staged changes exist under `destination`.
+    """
+    if pygit2 is not None:
+        try:
+            prefix = os.path.relpath(os.path.abspath(destination), os.path.abspath(git_root)).rstrip('/') + '/'
+
+            with _git_index_lock:
+                repo = pygit2.Repository(git_root)
+                repo.index.add_all([prefix])
+                repo.index.write()
+
+                try:
+                    # Compare the index against HEAD's tree, the same question
+                    # `git diff --cached` answers
+                    diff = repo.diff('HEAD', cached=True)
+                    changed = any(delta.new_file.path.startswith(prefix) for delta in diff.deltas)
+                except (KeyError, pygit2.GitError):
+                    # Unborn HEAD: any index entry under the space is a change
+                    changed = any(entry.path.startswith(prefix) for entry in repo.index)
+
+            if changed:
+                logging.info(f"Staged changes detected under \'{destination}\'")
+            else:
+                logging.info(f"No staged changes under \'{destination}\'")
+            return changed
+
+        except Exception as e:
+            logging.warning(f"pygit2 staging failed for \'{destination}\'; falling back to git CLI: {e}")
 
-        logging.info(f"Successfully added \'{filename}\' to git staging area")
+    try:
+        # Ensure the destination path is an absolute path
+        dest_path = os.path.abspath(destination)
+
+        # Concurrent git processes would fight over the index lock, so hold ours
+        with _git_index_lock:
+            subprocess.run(["git", "add", "-A", "--", dest_path], cwd=git_root, check=True,
+                           stderr=subprocess.PIPE, text=True)
+            result = subprocess.run(["git", "diff", "--cached", "--name-only", "-z", "--", dest_path],
+                                    cwd=git_root, check=True, capture_output=True, text=True)
+
+        changed = bool(result.stdout.strip('\0'))
+        if changed:
+            logging.info(f"Staged changes detected under \'{destination}\'")
+        else:
+            logging.info(f"No staged changes under \'{destination}\'")
+        return changed
 
     except subprocess.CalledProcessError as e:
-        logging.error(f"Git add failed for \'{filename}\': {e}")
+        logging.error(f"Git staging failed for \'{destination}\': {e}")
+        return False
     except Exception as e:
-        logging.error(f"Unknown error occurred while adding \'{filename}\': {e}")
+        logging.error(f"Unknown error occurred while staging \'{destination}\': {e}")
+        return False
 
 
 def commit_all_changes(git_root):
@@ -263,10 +718,29 @@ def commit_all_changes(git_root):
     Args:
         destination (str): Path to the git repository.
     """
-    try:
-        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        message = f"Updated {current_time}"
+    current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    message = f"Updated {current_time}"
+
+    if pygit2 is not None:
+        try:
+            with _git_index_lock:
+                repo = pygit2.Repository(git_root)
+                try:
+                    signature = repo.default_signature
+                except (KeyError, pygit2.GitError):
+                    # No user.name/user.email configured; use a local identity
+                    signature = pygit2.Signature('inconfluential', 'inconfluential@localhost')
+                tree = repo.index.write_tree()
+                parents = [] if repo.head_is_unborn else [repo.head.target]
+                repo.create_commit('HEAD', signature, signature, message, tree, parents)
+
+            logging.info(f"Successfully committed changes with message: {message}")
+            return
+
+        except Exception as e:
+            logging.warning(f"pygit2 commit failed; falling back to git CLI: {e}")
 
+    try:
         result = subprocess.run(["git", "commit", "-m", message], cwd=git_root, check=True, stderr=subprocess.PIPE, text=True)
 
         if result.returncode != 0:
@@ -352,16 +826,28 @@ def main():
 
     # Initialize Confluence client
     try:
-        confluence = Confluence(url=confluence_instance, username=username, password=password)
-
-        # Loop over each space key
-        for space_key in space_keys:
-            # Set the destination for this space
+        confluence = ConfluenceClient(url=confluence_instance, username=username, password=password)
+
+        # requests' default pool holds 10 connections, which would cap the
+        # worker threads above it; widen it so keep-alive reuse scales with
+        # the concurrency and no request pays a fresh TLS handshake.
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64)
+        confluence._session.mount('https://', adapter)
+        confluence._session.mount('http://', adapter)
+
+        # Sync all spaces concurrently; wall time becomes the slowest space
+        # instead of the sum. Each worker only shares the Confluence client
+        # (requests.Session is thread-safe) and the lock-guarded state files.
+        def sync_space(space_key):
             space_destination = os.path.join(export_destination, space_key)
-            # Fetch and save all pages for this space
-            space_changes_made = fetch_pages_and_save(confluence, space_key, space_destination, export_destination)
-            if space_changes_made:
-                changes_made = True
+            return fetch_pages_and_save(confluence, space_key, space_destination, export_destination)
+
+        with ThreadPoolExecutor(max_workers=min(8, len(space_keys))) as executor:
+            # Materialize every result before any(): consuming the map lazily
+            # would short-circuit on the first True and silently discard a
+            # later space's failure instead of propagating it
+            results = list(executor.map(sync_space, space_keys))
+        changes_made = any(results)
 
         # After all spaces have been processed, commit changes if any
         if changes_made:
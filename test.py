@@ -2,10 +2,9 @@
 
 import os
 import dotenv
-from atlassian import Confluence
 from dotenv import load_dotenv
 from markdownify import MarkdownConverter
-from inconfluential import AtlassianConverter
+from inconfluential import ConfluenceClient, get_converter, title_to_filename
 
 def main():
     # Load the environment variables.
@@ -21,7 +20,7 @@ def main():
     page_title = input("Enter the title of the page you want to pull for testing: ")
 
     # Connect to Confluence
-    confluence = Confluence(url=confluence_instance, username=username, password=password)
+    confluence = ConfluenceClient(url=confluence_instance, username=username, password=password)
 
     # Fetch the page by title
     page_id = confluence.get_page_id(space_key, page_title)
@@ -31,10 +30,10 @@ def main():
 
     # Retrieve the full page content
     page = confluence.get_page_by_id(page_id, expand="body.storage,version")
-    markdown_content = AtlassianConverter().convert(page['body']['storage']['value'])
+    markdown_content = get_converter().convert(page['body']['storage']['value'])
 
     # Define filename and write to .md file
-    filename = f"{export_destination}/{page_title.replace('/', '_')}.md"
+    filename = title_to_filename(export_destination, page_title)
     with open(filename, 'w', encoding='utf-8') as f:
         f.write(markdown_content)
 
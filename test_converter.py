@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+
+from inconfluential import AtlassianConverter
+
+
+def test_cdata_code_body_survives_conversion():
+    # Confluence wraps code-macro bodies in CDATA; the content must reach the
+    # Markdown output regardless of which HTML parser is in use.
+    html = ('<ac:structured-macro ac:name="code">'
+            '<ac:plain-text-body><![CDATA[print("hello")]]></ac:plain-text-body>'
+            '</ac:structured-macro>')
+    markdown = AtlassianConverter().convert(html)
+    assert 'print("hello")' in markdown
+
+
+def test_cdata_split_terminator_survives_conversion():
+    # Confluence splits a literal ']]>' across two CDATA sections; both halves
+    # must be stitched back together in the output.
+    html = ('<ac:structured-macro ac:name="code">'
+            '<ac:plain-text-body><![CDATA[a]]]]><![CDATA[>b]]></ac:plain-text-body>'
+            '</ac:structured-macro>')
+    markdown = AtlassianConverter().convert(html)
+    assert 'a]]' in markdown and 'b' in markdown
+
+
+def test_macro_title_parameter_becomes_heading():
+    html = ('<ac:structured-macro ac:name="info">'
+            '<ac:parameter ac:name="title">Heads Up</ac:parameter>'
+            '<p>note body</p>'
+            '</ac:structured-macro>')
+    markdown = AtlassianConverter().convert(html)
+    assert '#### Heads Up' in markdown
+    assert 'note body' in markdown